@@ -9,15 +9,42 @@ This module provides functionality to:
 - Export data to Excel with proper time formatting and formulas
 """
 
+import os
 import win32evtlog
-from datetime import datetime, timedelta
+from xml.etree import ElementTree
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta, timezone
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Final, Iterable, Iterator, NamedTuple, Optional
+import numpy as np
 import openpyxl
-from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
-from openpyxl import utils
+import xlsxwriter
+from openpyxl.styles import Font, PatternFill, Border, Side, Alignment, NamedStyle
+from openpyxl.styles.fonts import DEFAULT_FONT
 import argparse
 
+# Windows event IDs
+LOGON: Final[int] = 4624
+LOGOFF_1: Final[int] = 4634
+LOGOFF_2: Final[int] = 4647
+EXPLICIT_CREDS: Final[int] = 4648
+RDP_RECONNECT: Final[int] = 4778
+RDP_DISCONNECT: Final[int] = 4779
+LOCKED: Final[int] = 4800
+UNLOCKED: Final[int] = 4801
+SCREENSAVER_ON: Final[int] = 4802
+SCREENSAVER_OFF: Final[int] = 4803
+SYSTEM_START: Final[int] = 6005
+SYSTEM_SHUTDOWN: Final[int] = 6006
+
+class UserEvent(NamedTuple):
+    """A matched event of the tracked user."""
+    event_id: int
+    timestamp: int  # Local wall-clock microseconds since ActivityTracker.TIMESTAMP_EPOCH
+
 class ActivityTracker:
     """
     Tracks Windows user activity from Security Event Log and exports to Excel.
@@ -26,28 +53,80 @@ class ActivityTracker:
     and maintains an Excel log with time-formatted data and automatic calculations.
     """
 
-    # Event IDs for different Windows security events
+    # Event IDs for different Windows security events, by name
     EVENT_IDS = {
-        'LOGON': 4624,
-        'LOGOFF_1': 4634,
-        'LOGOFF_2': 4647,
-        'EXPLICIT_CREDS': 4648,
-        'RDP_RECONNECT': 4778,
-        'RDP_DISCONNECT': 4779,
-        'LOCKED': 4800,
-        'UNLOCKED': 4801,
-        'SCREENSAVER_ON': 4802,
-        'SCREENSAVER_OFF': 4803,
-        'SYSTEM_START': 6005,
-        'SYSTEM_SHUTDOWN': 6006
+        'LOGON': LOGON,
+        'LOGOFF_1': LOGOFF_1,
+        'LOGOFF_2': LOGOFF_2,
+        'EXPLICIT_CREDS': EXPLICIT_CREDS,
+        'RDP_RECONNECT': RDP_RECONNECT,
+        'RDP_DISCONNECT': RDP_DISCONNECT,
+        'LOCKED': LOCKED,
+        'UNLOCKED': UNLOCKED,
+        'SCREENSAVER_ON': SCREENSAVER_ON,
+        'SCREENSAVER_OFF': SCREENSAVER_OFF,
+        'SYSTEM_START': SYSTEM_START,
+        'SYSTEM_SHUTDOWN': SYSTEM_SHUTDOWN
+    }
+
+    # Reverse lookup of event names by ID
+    ID_TO_NAME = {event_id: name for name, event_id in EVENT_IDS.items()}
+
+    # System events (startup/shutdown) that apply to all users
+    SYSTEM_EVENT_IDS = frozenset({SYSTEM_START, SYSTEM_SHUTDOWN})
+
+    # EventData field holding the user name for each user-specific event
+    USER_NAME_FIELDS = {
+        LOGON: 'TargetUserName',
+        LOGOFF_1: 'TargetUserName',
+        LOGOFF_2: 'SubjectUserName',
+        EXPLICIT_CREDS: 'SubjectUserName',
+        RDP_RECONNECT: 'AccountName',
+        RDP_DISCONNECT: 'AccountName',
+        LOCKED: 'TargetUserName',
+        UNLOCKED: 'TargetUserName',
+        SCREENSAVER_ON: 'TargetUserName',
+        SCREENSAVER_OFF: 'TargetUserName'
+    }
+
+    # Default EventData positions of the user name fields, used when the
+    # publisher metadata can't be read
+    USER_FIELD_INDICES = {
+        LOGON: 5,
+        LOGOFF_1: 1,
+        LOGOFF_2: 1,
+        EXPLICIT_CREDS: 1,
+        RDP_RECONNECT: 0,
+        RDP_DISCONNECT: 0,
+        LOCKED: 1,
+        UNLOCKED: 1,
+        SCREENSAVER_ON: 1,
+        SCREENSAVER_OFF: 1
     }
 
-    # Excel styling constants
-    HEADER_COLOR = "2F5597"  # Dark blue
-    SUBHEADER_COLOR = "B4C6E7"  # Light blue
-    TOTAL_COLOR = "F2C5A0"  # Light orange
-    SESSION_COLOR = "E2EFDA"  # Light green
-    ALTERNATE_COLOR = "F8F9FA"  # Very light gray
+    # Provider publishing the monitored Security events
+    PUBLISHER_NAME = "Microsoft-Windows-Security-Auditing"
+
+    # Excel styling constants (opaque ARGB; 6-digit RGB gets a zero alpha)
+    HEADER_COLOR = "FF2F5597"  # Dark blue
+    SUBHEADER_COLOR = "FFB4C6E7"  # Light blue
+    TOTAL_COLOR = "FFF2C5A0"  # Light orange
+    SESSION_COLOR = "FFE2EFDA"  # Light green
+    ALTERNATE_COLOR = "FFF8F9FA"  # Very light gray
+    WHITE_COLOR = "FFFFFFFF"
+
+    # Shared style objects, assigned by reference to every styled cell
+    FILL_HEADER = PatternFill(start_color=HEADER_COLOR, end_color=HEADER_COLOR, fill_type="solid")
+    FILL_SESSION = PatternFill(start_color=SESSION_COLOR, end_color=SESSION_COLOR, fill_type="solid")
+    FILL_TOTAL = PatternFill(start_color=TOTAL_COLOR, end_color=TOTAL_COLOR, fill_type="solid")
+    FILL_ALT = PatternFill(start_color=ALTERNATE_COLOR, end_color=ALTERNATE_COLOR, fill_type="solid")
+    FILL_WHITE = PatternFill(start_color=WHITE_COLOR, end_color=WHITE_COLOR, fill_type="solid")
+    FONT_HEADER = Font(bold=True, color=WHITE_COLOR, size=12)
+    FONT_DATE = Font(bold=True, size=10)
+    FONT_SESSION = Font(size=9)
+    FONT_TOTAL_BOLD = Font(bold=True, size=10)
+    FONT_BOLD = Font(bold=True)
+    CENTER = Alignment(horizontal='center', vertical='center')
 
     # Border styles
     THIN_BORDER = Border(
@@ -64,9 +143,66 @@ class ActivityTracker:
         bottom=Side(style='medium')
     )
 
+    # Named cell styles registered once per workbook; cells reference them by name
+    NAMED_STYLES = {
+        'header': dict(font=FONT_HEADER, fill=FILL_HEADER, alignment=CENTER, border=THICK_BORDER),
+        'date_merged': dict(font=FONT_DATE, fill=FILL_SESSION, alignment=CENTER, border=THIN_BORDER),
+        'session_even': dict(font=FONT_SESSION, fill=FILL_WHITE, alignment=CENTER, border=THIN_BORDER),
+        'session_odd': dict(font=FONT_SESSION, fill=FILL_ALT, alignment=CENTER, border=THIN_BORDER),
+        'time_even': dict(font=DEFAULT_FONT, fill=FILL_WHITE, alignment=CENTER, border=THIN_BORDER,
+                          number_format='HH:MM'),
+        'time_odd': dict(font=DEFAULT_FONT, fill=FILL_ALT, alignment=CENTER, border=THIN_BORDER,
+                         number_format='HH:MM'),
+        'duration_even': dict(font=DEFAULT_FONT, fill=FILL_WHITE, alignment=CENTER, border=THIN_BORDER,
+                              number_format='[H]:MM'),
+        'duration_odd': dict(font=DEFAULT_FONT, fill=FILL_ALT, alignment=CENTER, border=THIN_BORDER,
+                             number_format='[H]:MM'),
+        'daily_total': dict(font=FONT_TOTAL_BOLD, fill=FILL_TOTAL, alignment=CENTER, border=THIN_BORDER),
+        'daily_total_blank': dict(font=DEFAULT_FONT, fill=FILL_TOTAL, border=THIN_BORDER),
+        'daily_total_duration': dict(font=FONT_BOLD, fill=FILL_TOTAL, alignment=CENTER, border=THIN_BORDER,
+                                     number_format='[H]:MM')
+    }
+
+    # Named styles for columns B:E of even and odd session rows
+    SESSION_ROW_STYLES = (
+        ('session_even', 'time_even', 'time_even', 'duration_even'),
+        ('session_odd', 'time_odd', 'time_odd', 'duration_odd')
+    )
+
+    # Named styles for columns B:E of a daily total row
+    TOTAL_ROW_STYLES = ('daily_total', 'daily_total_blank', 'daily_total_blank', 'daily_total_duration')
+
+    # xlsxwriter border weights for the openpyxl border styles in use
+    BORDER_WEIGHTS = {'thin': 1, 'medium': 2}
+
+    # Column widths for the vertical layout; columns at the default width
+    # need no per-column entry in openpyxl sheets
+    DEFAULT_COLUMN_WIDTH = 12
+    COLUMN_WIDTHS = {
+        'A': 12,  # Date column
+        'B': 14,  # Session column
+        'C': 12,  # Start time column
+        'D': 12,  # End time column
+        'E': 12   # Duration column
+    }
+
     # Session filtering
     MIN_SESSION_DURATION = 300  # 5 minutes in seconds
 
+    # Reference point for integer event timestamps (local wall clock)
+    TIMESTAMP_EPOCH = datetime(1970, 1, 1)
+    MICROSECONDS_PER_DAY = 86400 * 1_000_000
+
+    # Number of event handles fetched per EvtNext call
+    QUERY_BATCH_SIZE = 1024
+
+    # Threads rendering fetched batches; EvtRender runs outside the GIL
+    RENDER_WORKERS = os.cpu_count() or 1
+
+    # Workbooks with more rows than this are rebuilt with xlsxwriter
+    # instead of being loaded and edited in memory
+    REBUILD_ROW_THRESHOLD = 1000
+
     def __init__(self, username: str):
         """
         Initialize the activity tracker.
@@ -75,121 +211,186 @@ class ActivityTracker:
             username: Windows username to track (case-insensitive)
         """
         self.username = username
+        self._username_folded = username.casefold()
         self.script_dir = Path(__file__).parent
         self.excel_file = self.script_dir / 'activity_log.xlsx'
 
         # All event IDs we're interested in
         self.monitored_event_ids = list(self.EVENT_IDS.values())
 
-    def get_security_events(self) -> List[Any]:
+        # Render contexts and event field layout are resolved once per tracker
+        self._system_context = win32evtlog.EvtCreateRenderContext(win32evtlog.EvtRenderContextSystem)
+        self._user_context = win32evtlog.EvtCreateRenderContext(win32evtlog.EvtRenderContextUser)
+
+        # Single dispatch table: user field index, or -1 for system events
+        # that apply to all users; unknown IDs are rejected by the missing key
+        self._user_field_by_id = self._load_user_field_indices()
+        self._user_field_by_id.update(dict.fromkeys(self.SYSTEM_EVENT_IDS, -1))
+
+        # Match results by account name as rendered; bounded by the accounts on
+        # the machine. Shared by the render threads: a race only repeats a comparison
+        self._username_matches: Dict[str, bool] = {}
+
+    def _load_user_field_indices(self) -> Dict[int, int]:
         """
-        Get relevant events from Windows Security log.
+        Resolve the EventData position of the user name for each event ID.
 
-        Returns:
-            List of event objects from the Security log
+        Positions are read once from the publisher's event templates, falling
+        back to USER_FIELD_INDICES if the metadata is unavailable.
 
-        Raises:
-            Exception: If unable to access the Security Event Log
+        Returns:
+            Dictionary mapping event IDs to EventData value indices
         """
-        events = []
+        field_indices = dict(self.USER_FIELD_INDICES)
 
         try:
-            hand = win32evtlog.OpenEventLog(None, "Security")
-            flags = win32evtlog.EVENTLOG_BACKWARDS_READ | win32evtlog.EVENTLOG_SEQUENTIAL_READ
+            metadata = win32evtlog.EvtOpenPublisherMetadata(self.PUBLISHER_NAME)
+            metadata_enum = win32evtlog.EvtOpenEventMetadataEnum(metadata)
 
             while True:
-                events_batch = win32evtlog.ReadEventLog(hand, flags, 0)
-                if not events_batch:
+                event_metadata = win32evtlog.EvtNextEventMetadata(metadata_enum)
+                if event_metadata is None:
                     break
 
-                # Filter events by ID during reading for better performance
-                for event in events_batch:
-                    if event.EventID in self.monitored_event_ids:
-                        events.append(event)
+                event_id, _ = win32evtlog.EvtGetEventMetadataProperty(
+                    event_metadata, win32evtlog.EventMetadataEventID)
+                event_id &= 0xFFFF
+                field_name = self.USER_NAME_FIELDS.get(event_id)
+                if field_name is None:
+                    continue
+
+                # Template lists the EventData fields in rendering order
+                template, _ = win32evtlog.EvtGetEventMetadataProperty(
+                    event_metadata, win32evtlog.EventMetadataEventTemplate)
+                param_names = [
+                    node.get('name') for node in ElementTree.fromstring(template).iter()
+                    if node.tag.endswith('data')
+                ]
+                if field_name in param_names:
+                    field_indices[event_id] = param_names.index(field_name)
+
+        except Exception:
+            # Keep default positions for anything not resolved from metadata
+            pass
+
+        return field_indices
+
+    def _build_event_query(self, since: Optional[datetime] = None) -> str:
+        """
+        Build the XPath query that selects the monitored events server-side.
 
-            win32evtlog.CloseEventLog(hand)
+        Only event IDs (and optionally the start time) are filtered by the
+        Event Log service. XPath compares strings case-sensitively, so the user
+        name is matched in _render_user_events to keep it case-insensitive.
 
-        except Exception as e:
-            print(f"Error reading event log: {e}")
-            print("Make sure you're running with administrator privileges.")
-            return []
+        Args:
+            since: Optional naive local time; older events are excluded by the query
+        """
+        id_filter = " or ".join(f"EventID={event_id}" for event_id in self.monitored_event_ids)
 
-        return events
+        query = f"System[({id_filter})]"
+        if since is not None:
+            system_time = since.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+            query = f"System[TimeCreated[@SystemTime>='{system_time}']] and {query}"
 
-    def _get_event_type_name(self, event_id: int) -> str:
-        """Get human-readable name for event ID."""
-        for name, id_val in self.EVENT_IDS.items():
-            if id_val == event_id:
-                return name
-        return f"EVENT_{event_id}"
+        return f"*[{query}]"
 
-    def _check_user_match(self, event_id: int, strings: List[str]) -> bool:
+    def _iter_user_events(self, since: Optional[datetime] = None) -> Iterator[UserEvent]:
         """
-        Check if event belongs to the target user based on event type and string data.
+        Stream the target user's events from Windows Security log.
+
+        Event IDs are filtered by the Event Log service through an XPath
+        query, and each record is rendered into typed values
+        instead of XML. Batches are fetched on this thread and rendered and
+        matched on a thread pool, overlapping EvtNext with EvtRender; results
+        keep log order.
 
         Args:
-            event_id: Windows event ID
-            strings: List of string inserts from the event
+            since: Optional naive local time; older events are not read
 
-        Returns:
-            True if event belongs to target user
-        """
-        if not strings:
-            return False
+        Yields:
+            UserEvent records
 
-        username_lower = self.username.lower()
-
-        # Map event IDs to their username field indices
-        user_field_map = {
-            self.EVENT_IDS['LOGON']: 5,
-            self.EVENT_IDS['LOGOFF_1']: 1,
-            self.EVENT_IDS['LOGOFF_2']: 1,
-            self.EVENT_IDS['EXPLICIT_CREDS']: 1,
-            self.EVENT_IDS['RDP_RECONNECT']: 0,
-            self.EVENT_IDS['RDP_DISCONNECT']: 0,
-            self.EVENT_IDS['LOCKED']: 1,
-            self.EVENT_IDS['UNLOCKED']: 1,
-            self.EVENT_IDS['SCREENSAVER_ON']: 1,
-            self.EVENT_IDS['SCREENSAVER_OFF']: 1,
-        }
+        Reading stops with an error message if the Security Event Log can't be accessed.
+        """
+        try:
+            # Read oldest first so events arrive in time order (see calculate_sessions)
+            flags = win32evtlog.EvtQueryChannelPath | win32evtlog.EvtQueryForwardDirection
+            query = win32evtlog.EvtQuery("Security", flags, self._build_event_query(since))
+
+            with ThreadPoolExecutor(max_workers=self.RENDER_WORKERS) as executor:
+                # Bound the batches in flight so handles are not all held at once
+                pending = deque()
+                while True:
+                    events_batch = win32evtlog.EvtNext(query, self.QUERY_BATCH_SIZE)
+                    if not events_batch:
+                        break
 
-        # System events (startup/shutdown) apply to all users
-        if event_id in [self.EVENT_IDS['SYSTEM_START'], self.EVENT_IDS['SYSTEM_SHUTDOWN']]:
-            return True
+                    pending.append(executor.submit(self._render_user_events, events_batch))
+                    if len(pending) > self.RENDER_WORKERS:
+                        yield from pending.popleft().result()
 
-        # Check user field for other events
-        field_index = user_field_map.get(event_id)
-        if field_index is not None and len(strings) > field_index:
-            return strings[field_index].lower() == username_lower
+                while pending:
+                    yield from pending.popleft().result()
 
-        return False
+        except Exception as e:
+            print(f"Error reading event log: {e}")
+            print("Make sure you're running with administrator privileges.")
 
-    def filter_user_events(self, events: List[Any]) -> List[Dict[str, Any]]:
+    def _render_user_events(self, events_batch: Iterable[Any]) -> List[UserEvent]:
         """
-        Filter events for specific user using event property indices.
+        Render a batch of event handles, keeping only the target user's events.
+
+        The system values decide the event type first; user data is rendered
+        only for event types that carry a user name, and only the user name
+        field is read from it and compared case-insensitively.
 
         Args:
-            events: List of raw event objects
+            events_batch: Event handles returned by EvtNext
 
         Returns:
-            List of filtered event dictionaries
+            UserEvent records of matching events, in batch order
         """
-        user_events = []
+        render = win32evtlog.EvtRender
+        render_values = win32evtlog.EvtRenderEventValues
+        system_context = self._system_context
+        user_context = self._user_context
+        field_indices = self._user_field_by_id
+        username_folded = self._username_folded
+        username_matches = self._username_matches
+        epoch = self.TIMESTAMP_EPOCH
+        one_us = timedelta(microseconds=1)
 
-        for event in events:
+        user_events = []
+        for event in events_batch:
             try:
-                event_id = event.EventID & 0xFFFF  # Remove severity/facility bits
-
-                # Extract user data from event properties
-                if hasattr(event, 'StringInserts') and event.StringInserts:
-                    strings = event.StringInserts
-
-                    if self._check_user_match(event_id, strings):
-                        user_events.append({
-                            'EventID': event_id,
-                            'TimeCreated': event.TimeGenerated,
-                            'StringInserts': strings
-                        })
+                system_values = render(event, render_values, Context=system_context)
+                event_id = system_values[win32evtlog.EvtSystemEventID][0] & 0xFFFF  # Remove severity/facility bits
+
+                field_index = field_indices.get(event_id)
+                if field_index is None:
+                    continue
+
+                # System events (startup/shutdown) apply to all users; their
+                # EventData is never rendered
+                if field_index >= 0:
+                    user_values = render(event, render_values, Context=user_context)
+                    if field_index >= len(user_values):
+                        continue
+
+                    # Events of every account reach this point, but the same few
+                    # names repeat, so the case-insensitive comparison is cached per name
+                    user_name = user_values[field_index][0]
+                    matches = username_matches.get(user_name)
+                    if matches is None:
+                        matches = username_matches[user_name] = user_name.casefold() == username_folded
+                    if not matches:
+                        continue
+
+                # Convert to local time only for events we keep; the integer
+                # timestamp is computed once here, off the main thread
+                local_time = system_values[win32evtlog.EvtSystemTimeCreated][0].astimezone().replace(tzinfo=None)
+                user_events.append(UserEvent(event_id, (local_time - epoch) // one_us))
 
             except Exception:
                 # Skip events we can't parse
@@ -197,258 +398,387 @@ class ActivityTracker:
 
         return user_events
 
-    def calculate_sessions(self, events: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    def _get_event_type_name(self, event_id: int) -> str:
+        """Get human-readable name for event ID."""
+        return self.ID_TO_NAME.get(event_id, f"EVENT_{event_id}")
+
+    @staticmethod
+    def _pair_sessions(times: np.ndarray, ids: np.ndarray, days: np.ndarray,
+                       min_duration: int) -> tuple:
+        """
+        Pair session starts with LOCKED events using vectorized NumPy operations.
+
+        Each LOCKED event closes a segment that began after the previous lock
+        or at the start of the day; the session starts at the segment's last
+        UNLOCKED event, or at its first LOGON when there was no unlock.
+
+        Args:
+            times: Sorted int64 event timestamps
+            ids: int32 event IDs in the same order
+            days: int64 day numbers in the same order
+            min_duration: Minimum session length in timestamp units
+
+        Returns:
+            Tuple of (start_positions, end_positions) into the sorted arrays
+        """
+        positions = np.arange(len(times))
+
+        is_lock = ids == LOCKED
+        is_unlock = ids == UNLOCKED
+        is_logon = ids == LOGON
+
+        # A new segment begins after every lock and on every new day
+        new_segment = np.ones(len(times), dtype=bool)
+        new_segment[1:] = is_lock[:-1] | (days[1:] != days[:-1])
+        segment_start = np.maximum.accumulate(np.where(new_segment, positions, 0))
+
+        # Most recent unlock at or before, and first logon at or after, each position
+        last_unlock = np.maximum.accumulate(np.where(is_unlock, positions, -1))
+        next_logon = np.minimum.accumulate(np.where(is_logon, positions, len(times))[::-1])[::-1]
+
+        # Resolve the start of the segment closed by each lock
+        end_pos = np.flatnonzero(is_lock)
+        seg_start = segment_start[end_pos]
+        unlock_pos = last_unlock[end_pos]
+        logon_pos = next_logon[seg_start]
+        start_pos = np.where(unlock_pos >= seg_start, unlock_pos,
+                             np.where(logon_pos < end_pos, logon_pos, -1))
+
+        # Only count sessions longer than minimum duration
+        durations = times[end_pos] - times[np.maximum(start_pos, 0)]
+        keep = (start_pos >= 0) & (durations >= min_duration)
+        return start_pos[keep], end_pos[keep]
+
+    def calculate_sessions(self, events: List[UserEvent]) -> Dict[str, Dict[str, Any]]:
         """
         Calculate active sessions from lock/unlock events.
 
+        Event timestamps are gathered into typed arrays and paired by _pair_sessions.
+
         Args:
-            events: List of filtered user events
+            events: List of filtered user events from _iter_user_events
 
         Returns:
             Dictionary mapping date strings to session data
         """
-        # Group events by date
-        daily_data = {}
-        for event in events:
-            date_key = event['TimeCreated'].strftime('%Y-%m-%d')
-            daily_data.setdefault(date_key, []).append(event)
+        if not events:
+            return {}
+
+        # Local wall-clock microseconds keep the ordering of the naive datetimes
+        times = np.fromiter((e.timestamp for e in events), dtype=np.int64, count=len(events))
+        ids = np.fromiter((e.event_id for e in events), dtype=np.int32, count=len(events))
+
+        # Events are read oldest first, so they are normally already in order
+        # and a linear check replaces the sort; local clock changes (e.g. the
+        # end of daylight saving time) can break it, so fall back to a stable
+        # sort that keeps the log order of simultaneous events
+        if not np.all(times[1:] >= times[:-1]):
+            order = np.argsort(times, kind='stable')
+            times = times[order]
+            ids = ids[order]
+        days = times // self.MICROSECONDS_PER_DAY
+        start_pos, end_pos = self._pair_sessions(
+            times, ids, days, self.MIN_SESSION_DURATION * 1_000_000)
+
+        session_days = days[end_pos]
+        durations = (times[end_pos] - times[start_pos]) // 1_000_000
+
+        # Time of day as Excel serial values (fraction of a day)
+        start_serials = (times[start_pos] % self.MICROSECONDS_PER_DAY) / self.MICROSECONDS_PER_DAY
+        end_serials = (times[end_pos] % self.MICROSECONDS_PER_DAY) / self.MICROSECONDS_PER_DAY
+
+        # Sessions are in time order, so each day is a contiguous run; fold
+        # its integer durations in one reduceat call
+        _, day_offsets = np.unique(session_days, return_index=True)
+        if len(day_offsets) == 0:
+            return {}
+        day_totals = np.add.reduceat(durations, day_offsets)
+
+        # Sessions are already sorted, so groupby yields each day's run in
+        # order without a per-day dict or sort; dates are formatted once per day
+        rows = zip(session_days.tolist(), durations.tolist(),
+                   start_serials.tolist(), end_serials.tolist())
+        epoch_ordinal = self.TIMESTAMP_EPOCH.toordinal()
 
-        # Process each day
         results = {}
-        for date_str, day_events in daily_data.items():
-            # Sort events by time
-            day_events.sort(key=lambda x: x['TimeCreated'])
-
-            sessions = []
-            session_start = None
-
-            for event in day_events:
-                event_id = event['EventID']
-                event_time = event['TimeCreated']
-
-                # Start session on UNLOCKED (4801) or LOGON (4624)
-                if event_id == self.EVENT_IDS['UNLOCKED']:
-                    session_start = event_time
-                elif event_id == self.EVENT_IDS['LOGON'] and session_start is None:
-                    session_start = event_time
-
-                # End session on LOCKED (4800)
-                elif event_id == self.EVENT_IDS['LOCKED'] and session_start is not None:
-                    duration = event_time - session_start
-
-                    # Only count sessions longer than minimum duration
-                    if duration.total_seconds() >= self.MIN_SESSION_DURATION:
-                        sessions.append({
-                            'start': session_start,
-                            'end': event_time,
-                            'duration': duration
-                        })
-
-                    session_start = None
-
-            if sessions:
-                total_duration = sum((s['duration'] for s in sessions), timedelta())
-                results[date_str] = {
-                    'sessions': sessions,
-                    'total_duration': total_duration,
-                    'total_sessions': len(sessions)
+        for (day, day_rows), total_duration in zip(groupby(rows, key=itemgetter(0)),
+                                                   day_totals.tolist()):
+            sessions = [
+                {
+                    'start_serial': start_serial,
+                    'end_serial': end_serial,
+                    'duration': duration  # whole seconds
                 }
+                for _, duration, start_serial, end_serial in day_rows
+            ]
+            results[date.fromordinal(epoch_ordinal + day).isoformat()] = {
+                'sessions': sessions,
+                'total_duration': total_duration,
+                'total_sessions': len(sessions)
+            }
 
         return results
 
-    def format_duration(self, duration: timedelta) -> str:
+    def format_duration(self, duration: int) -> str:
         """
         Format duration as 'Xh Ym'.
 
         Args:
-            duration: Time duration to format
+            duration: Time duration to format, in whole seconds
 
         Returns:
             Formatted duration string
         """
-        total_seconds = int(duration.total_seconds())
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) // 60
-        return f"{hours}h {minutes}m"
-
-    def _setup_excel_headers(self, ws) -> None:
-        """Set up Excel headers for vertical layout with enhanced styling."""
-        headers = ["Date", "Session", "Start Time", "End Time", "Duration"]
+        hours, remainder = divmod(duration, 3600)
+        return f"{hours}h {remainder // 60}m"
 
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF", size=12)
-            cell.fill = PatternFill(start_color=self.HEADER_COLOR, end_color=self.HEADER_COLOR, fill_type="solid")
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.border = self.THICK_BORDER
+    def _register_named_styles(self, wb) -> None:
+        """Register NAMED_STYLES on the workbook, skipping any it already has."""
+        for name, attributes in self.NAMED_STYLES.items():
+            if name not in wb.named_styles:
+                wb.add_named_style(NamedStyle(name=name, **attributes))
 
     def _add_session_rows(self, ws, date_str: str, sessions: List[Dict], start_row: int) -> int:
         """Add session data as rows with proper formatting and styling."""
         current_row = start_row
 
         for i, session in enumerate(sessions):
-            # Convert to time values for Excel
-            start_time = session['start'].time()
-            end_time = session['end'].time()
-
-            # Determine row color (alternating pattern)
-            row_color = self.ALTERNATE_COLOR if i % 2 == 1 else "FFFFFF"
-
-            # Date column (only for first session of the day, merge for others)
-            if i == 0:
-                date_cell = ws.cell(row=current_row, column=1, value=date_str)
-                date_cell.font = Font(bold=True, size=10)
-                date_cell.fill = PatternFill(start_color=self.SESSION_COLOR, end_color=self.SESSION_COLOR, fill_type="solid")
-                date_cell.alignment = Alignment(horizontal='center', vertical='center')
-                date_cell.border = self.THIN_BORDER
-
-                # Merge date cells if multiple sessions
-                if len(sessions) > 1:
-                    ws.merge_cells(start_row=current_row, start_column=1,
-                                 end_row=current_row + len(sessions) - 1, end_column=1)
-
-            # Session number column
-            session_cell = ws.cell(row=current_row, column=2, value=f"Session {i+1}")
-            session_cell.font = Font(size=9)
-            session_cell.fill = PatternFill(start_color=row_color, end_color=row_color, fill_type="solid")
-            session_cell.alignment = Alignment(horizontal='center', vertical='center')
-            session_cell.border = self.THIN_BORDER
-
-            # Start time column
-            start_cell = ws.cell(row=current_row, column=3, value=start_time)
-            start_cell.number_format = 'HH:MM'
-            start_cell.alignment = Alignment(horizontal='center', vertical='center')
-            start_cell.fill = PatternFill(start_color=row_color, end_color=row_color, fill_type="solid")
-            start_cell.border = self.THIN_BORDER
-
-            # End time column
-            end_cell = ws.cell(row=current_row, column=4, value=end_time)
-            end_cell.number_format = 'HH:MM'
-            end_cell.alignment = Alignment(horizontal='center', vertical='center')
-            end_cell.fill = PatternFill(start_color=row_color, end_color=row_color, fill_type="solid")
-            end_cell.border = self.THIN_BORDER
-
-            # Duration formula (End - Start)
-            duration_formula = f'=D{current_row}-C{current_row}'
-            duration_cell = ws.cell(row=current_row, column=5, value=duration_formula)
-            duration_cell.number_format = '[H]:MM'
-            duration_cell.alignment = Alignment(horizontal='center', vertical='center')
-            duration_cell.fill = PatternFill(start_color=row_color, end_color=row_color, fill_type="solid")
-            duration_cell.border = self.THIN_BORDER
-
+            # Session number, start/end Excel time serials and duration formula (End - Start)
+            values = (f"Session {i+1}", session['start_serial'], session['end_serial'],
+                      f'=D{current_row}-C{current_row}')
+            self._write_styled_row(ws, current_row, values, self.SESSION_ROW_STYLES[i % 2])
             current_row += 1
 
+        # Date column (only for first session of the day; merged by the caller)
+        ws.cell(row=start_row, column=1, value=date_str).style = 'date_merged'
+
         # Add daily total row
-        total_cell = ws.cell(row=current_row, column=2, value="Daily Total")
-        total_cell.font = Font(bold=True, size=10)
-        total_cell.fill = PatternFill(start_color=self.TOTAL_COLOR, end_color=self.TOTAL_COLOR, fill_type="solid")
-        total_cell.alignment = Alignment(horizontal='center', vertical='center')
-        total_cell.border = self.THIN_BORDER
-
-        # Empty cells for start/end columns in total row
-        for col in [3, 4]:
-            empty_cell = ws.cell(row=current_row, column=col, value="")
-            empty_cell.fill = PatternFill(start_color=self.TOTAL_COLOR, end_color=self.TOTAL_COLOR, fill_type="solid")
-            empty_cell.border = self.THIN_BORDER
-
-        # Total duration formula
-        if len(sessions) > 0:
-            start_formula_row = start_row
-            end_formula_row = current_row - 1
-            total_formula = f'=SUM(E{start_formula_row}:E{end_formula_row})'
-
-            total_duration_cell = ws.cell(row=current_row, column=5, value=total_formula)
-            total_duration_cell.number_format = '[H]:MM'
-            total_duration_cell.font = Font(bold=True)
-            total_duration_cell.fill = PatternFill(start_color=self.TOTAL_COLOR, end_color=self.TOTAL_COLOR, fill_type="solid")
-            total_duration_cell.alignment = Alignment(horizontal='center', vertical='center')
-            total_duration_cell.border = self.THIN_BORDER
+        self._update_daily_total(ws, list(range(start_row, current_row)))
 
         return current_row + 2  # Return next available row (with spacing)
 
-    def _find_date_in_excel(self, ws, date_str: str) -> tuple:
-        """Find if a date already exists in Excel. Returns (exists, last_row_for_date)."""
-        for row in range(2, ws.max_row + 1):
-            cell_value = ws.cell(row=row, column=1).value
-            if cell_value == date_str:
-                # Found the date, now find the last row for this date
-                last_row = row
-                for check_row in range(row + 1, ws.max_row + 1):
-                    next_cell = ws.cell(row=check_row, column=1).value
-                    if next_cell and next_cell != date_str:
-                        break
-                    if ws.cell(row=check_row, column=2).value:  # If there's session data
-                        last_row = check_row
-                return True, last_row
-        return False, 0
-
-    def _count_existing_sessions(self, ws, date_str: str) -> int:
-        """Count existing sessions for a specific date in Excel."""
-        count = 0
-        for row in range(2, ws.max_row + 1):
-            if ws.cell(row=row, column=1).value == date_str:
-                session_value = ws.cell(row=row, column=2).value
-                if session_value and isinstance(session_value, str) and session_value.startswith("Session"):
-                    count += 1
-        return count
+    def _write_styled_row(self, ws, row: int, values: tuple, styles: tuple, start_column: int = 2) -> None:
+        """Write values and their named styles into consecutive cells of a row in one pass."""
+        for column, (value, style) in enumerate(zip(values, styles), start_column):
+            ws.cell(row=row, column=column, value=value).style = style
 
-    def _set_column_widths(self, ws) -> None:
-        """Set appropriate column widths for vertical layout."""
-        column_widths = {
-            'A': 12,  # Date column
-            'B': 14,  # Session column
-            'C': 12,  # Start time column
-            'D': 12,  # End time column
-            'E': 12   # Duration column
-        }
+    def _merge_date_cells(self, ws, row_ranges: List[tuple]) -> None:
+        """Merge the date column over each (first_row, last_row) range, replacing existing merges."""
+        first_rows = {first_row for first_row, _ in row_ranges}
+        for merged_range in list(ws.merged_cells.ranges):
+            if merged_range.min_col == 1 and merged_range.min_row in first_rows:
+                ws.unmerge_cells(merged_range.coord)
 
-        for col_letter, width in column_widths.items():
-            ws.column_dimensions[col_letter].width = width
+        for first_row, last_row in row_ranges:
+            if last_row > first_row:
+                ws.merge_cells(start_row=first_row, start_column=1, end_row=last_row, end_column=1)
 
-    def create_or_update_excel(self, activity_data: Dict[str, Dict[str, Any]]) -> None:
+    def _build_date_index(self, ws) -> Dict[str, List[tuple]]:
         """
-        Create or update Excel file with activity data in vertical layout.
+        Map each date in the sheet to its session rows.
+
+        The sheet is scanned once without creating Cell objects. Date cells are
+        merged across a day's sessions, so later rows of a day have an empty
+        column A and inherit the most recent date label. Start and end cells
+        come back as time values and are converted to Excel serials.
+
+        Returns:
+            Dictionary mapping dates to (row, start_serial, end_serial) tuples
+        """
+        date_index = {}
+        session_rows = None
+
+        for row_idx, (date_value, session_value, start, end) in enumerate(
+                ws.iter_rows(min_row=2, max_col=4, values_only=True), start=2):
+            if date_value:
+                session_rows = date_index.setdefault(date_value, [])
+            if (session_rows is not None and isinstance(session_value, str)
+                    and session_value.startswith("Session")):
+                session_rows.append((row_idx, self._to_serial(start), self._to_serial(end)))
+
+        return date_index
+
+    def _read_date_index(self) -> Dict[str, List[tuple]]:
+        """Build the date index of the Excel file in read-only mode."""
+        wb = openpyxl.load_workbook(self.excel_file, read_only=True)
+        try:
+            return self._build_date_index(wb.active)
+        finally:
+            wb.close()
+
+    @staticmethod
+    def _parse_date_label(value) -> Optional[datetime]:
+        """Parse a column A label written by this tool ('YYYY-MM-DD'), or return None."""
+        if not isinstance(value, str):
+            return None
+        try:
+            return datetime.strptime(value, '%Y-%m-%d')
+        except ValueError:
+            return None
+
+    def _get_resume_time(self, date_index: Dict[str, List[tuple]]) -> Optional[datetime]:
+        """
+        Return local midnight of the last date in the date index, or None if there is none.
+
+        Labels that are not 'YYYY-MM-DD' strings (notes, dates typed in by hand)
+        are ignored, so they don't disable the time bound.
+        """
+        dates = [date_value for date_value in map(self._parse_date_label, date_index) if date_value]
+        return max(dates, default=None)
+
+    def _get_new_sessions(self, existing_rows: List[tuple], data: Dict[str, Any]) -> Optional[List[Dict]]:
+        """
+        Return the log sessions of a date that are missing from Excel.
+
+        Existing rows must match the first log sessions by start and end time
+        (to the second); a date whose rows differ from the log is left as is,
+        so sessions are never appended after mismatched rows.
 
         Args:
-            activity_data: Dictionary mapping dates to session data
+            existing_rows: (row, start_serial, end_serial) tuples from _build_date_index
+            data: Session data for the date from calculate_sessions
+
+        Returns:
+            Sessions to append, empty if there are none, or None if the
+            existing rows differ from the log
         """
-        # Load existing workbook or create new one
-        if self.excel_file.exists():
-            wb = openpyxl.load_workbook(self.excel_file)
-            ws = wb.active
-        else:
-            wb = openpyxl.Workbook()
-            ws = wb.active
-            ws.title = "Activity Log"
+        sessions = data['sessions']
+        if len(existing_rows) >= len(sessions):
+            return []
+
+        for (_, start, end), session in zip(existing_rows, sessions):
+            if (not isinstance(start, float) or not isinstance(end, float)
+                    or abs(start - session['start_serial']) * 86400 >= 1
+                    or abs(end - session['end_serial']) * 86400 >= 1):
+                return None
+
+        return sessions[len(existing_rows):]
+
+    def _plan_excel_updates(self, activity_data: Dict[str, Dict[str, Any]],
+                            date_index: Dict[str, List[tuple]]) -> Dict[str, List[Dict]]:
+        """
+        Decide which sessions to write for each date.
+
+        Dates not yet in Excel get all their sessions. A date already in Excel
+        gets the sessions from _get_new_sessions only if it is the last date
+        block in the sheet, because new rows go directly below its sessions.
+
+        Args:
+            activity_data: Dictionary mapping dates to session data
+            date_index: Existing session rows by date, from _build_date_index
 
-            # Create headers for new workbook
-            self._setup_excel_headers(ws)
+        Returns:
+            Dictionary mapping dates to the sessions to write, in date order
+        """
+        last_row = max((rows[-1][0] for rows in date_index.values() if rows), default=1)
 
-        # Process each date in activity data
+        updates = {}
         for date_str, data in sorted(activity_data.items()):
             print(f"Processing date: {date_str} with {data['total_sessions']} sessions")
 
-            # Check if date already exists and count existing sessions
-            date_exists, last_row = self._find_date_in_excel(ws, date_str)
-            existing_sessions = self._count_existing_sessions(ws, date_str) if date_exists else 0
-
-            # Only process if we have more sessions in log than in Excel
-            if existing_sessions >= data['total_sessions']:
-                print(f"  Skipping {date_str} - Excel has {existing_sessions} sessions, log has {data['total_sessions']}")
+            existing_rows = date_index.get(date_str, [])
+            if not existing_rows:
+                print(f"  Creating new entry for {date_str}")
+                updates[date_str] = data['sessions']
                 continue
 
-            if date_exists:
-                print(f"  Adding {data['total_sessions'] - existing_sessions} new sessions to {date_str}")
-                # Add only new sessions
-                new_sessions = data['sessions'][existing_sessions:]
-                # Find next available row (skip total row if it exists)
-                next_row = last_row + 2 if ws.cell(row=last_row + 1, column=2).value == "Daily Total" else last_row + 1
-                self._add_new_session_rows(ws, date_str, new_sessions, next_row, existing_sessions)
+            # Only process if the log has sessions beyond those already in Excel
+            new_sessions = self._get_new_sessions(existing_rows, data)
+            if new_sessions is None:
+                print(f"  Skipping {date_str} - Excel rows differ from the log, left unchanged")
+            elif not new_sessions:
+                print(f"  Skipping {date_str} - Excel has {len(existing_rows)} sessions, log has {data['total_sessions']}")
+            elif existing_rows[-1][0] != last_row:
+                print(f"  Skipping {date_str} - later dates follow it in Excel")
+            else:
+                print(f"  Adding {len(new_sessions)} new sessions to {date_str}")
+                updates[date_str] = new_sessions
+
+        return updates
+
+    @staticmethod
+    def _to_serial(value) -> float:
+        """Convert a time read back from Excel into a fraction of a day."""
+        if isinstance(value, time):
+            return (value.hour * 3600 + value.minute * 60 + value.second
+                    + value.microsecond / 1_000_000) / 86400
+        return value
+
+    def _set_column_widths(self, ws) -> None:
+        """Set appropriate column widths for vertical layout."""
+        ws.sheet_format.defaultColWidth = self.DEFAULT_COLUMN_WIDTH
+        for col_letter, width in self.COLUMN_WIDTHS.items():
+            if width != self.DEFAULT_COLUMN_WIDTH:
+                ws.column_dimensions[col_letter].width = width
+
+    def create_or_update_excel(self, activity_data: Dict[str, Dict[str, Any]],
+                               date_index: Optional[Dict[str, List[tuple]]] = None) -> None:
+        """
+        Create or update Excel file with activity data in vertical layout.
+
+        Args:
+            activity_data: Dictionary mapping dates to session data
+            date_index: Existing session rows by date from _read_date_index,
+                        read from the file if not given
+        """
+        # New files are written directly with xlsxwriter
+        if not self.excel_file.exists():
+            self._create_with_xlsxwriter(activity_data)
+            print(f"Excel file created: {self.excel_file}")
+            return
+
+        # One read-only pass indexes existing sessions and decides whether
+        # the workbook needs changing
+        if date_index is None:
+            date_index = self._read_date_index()
+
+        # Both the rebuild and the in-place update write exactly these sessions
+        updates = self._plan_excel_updates(activity_data, date_index)
+        if not updates:
+            print("Excel file is up to date - no new sessions to add")
+            return
+
+        # Large files are rewritten from scratch instead of loading every cell
+        last_row = max((rows[-1][0] for rows in date_index.values() if rows), default=1)
+        if last_row > self.REBUILD_ROW_THRESHOLD:
+            if self._can_rebuild(date_index):
+                self._rebuild_excel(updates, date_index)
+                print(f"Excel file rebuilt: {self.excel_file}")
+                return
+            print("Excel file has content a rebuild would not keep - updating it in place")
+
+        wb = openpyxl.load_workbook(self.excel_file)
+        ws = wb.active
+        self._register_named_styles(wb)
+
+        # Date column merges are applied together after all rows are written;
+        # they also record whether anything was written
+        pending_merges = []
+
+        # The last date in the sheet is extended before new dates are appended below it
+        for date_str, new_sessions in sorted(updates.items(), key=lambda item: not date_index.get(item[0])):
+            session_rows = [row for row, _, _ in date_index.get(date_str, [])]
+
+            if session_rows:
+                # New sessions are written over the total row, which moves below them
+                total_row = session_rows[-1] + 1
+                if total_row < ws.max_row:
+                    print(f"  Skipping {date_str} - rows follow its daily total in Excel")
+                    continue
+
+                self._add_new_session_rows(ws, session_rows, new_sessions, total_row)
+                pending_merges.append((session_rows[0], session_rows[-1]))
             else:
-                print(f"  Creating new entry for {date_str}")
                 # Find next available row
                 next_row = ws.max_row + 1 if ws.max_row > 1 else 2
-                self._add_session_rows(ws, date_str, data['sessions'], next_row)
+                self._add_session_rows(ws, date_str, new_sessions, next_row)
+                pending_merges.append((next_row, next_row + len(new_sessions) - 1))
+
+        if not pending_merges:
+            print("Excel file is up to date - no new sessions to add")
+            return
+
+        self._merge_date_cells(ws, pending_merges)
 
         # Apply final formatting
         self._apply_final_formatting(ws)
@@ -460,103 +790,197 @@ class ActivityTracker:
         wb.save(self.excel_file)
         print(f"Excel file updated: {self.excel_file}")
 
-    def _add_new_session_rows(self, ws, date_str: str, new_sessions: List[Dict], start_row: int, existing_count: int) -> None:
-        """Add only new session rows for an existing date."""
+    def _add_xlsxwriter_formats(self, wb) -> Dict[str, Any]:
+        """
+        Translate NAMED_STYLES into xlsxwriter formats, created once per workbook.
+
+        Args:
+            wb: xlsxwriter Workbook
+
+        Returns:
+            Dictionary mapping style names to xlsxwriter Format objects
+        """
+        formats = {}
+        for name, attributes in self.NAMED_STYLES.items():
+            font = attributes['font']
+            properties = {
+                'bold': bool(font.b),
+                'bg_color': f"#{attributes['fill'].fgColor.rgb[-6:]}",
+                'border': self.BORDER_WEIGHTS[attributes['border'].left.style]
+            }
+            if font.sz is not None:
+                properties['font_size'] = font.sz
+            if font.color is not None and font.color.type == 'rgb':
+                properties['font_color'] = f"#{font.color.rgb[-6:]}"
+
+            alignment = attributes.get('alignment')
+            if alignment is not None:
+                properties['align'] = alignment.horizontal
+                properties['valign'] = 'vcenter' if alignment.vertical == 'center' else alignment.vertical
+
+            if 'number_format' in attributes:
+                properties['num_format'] = attributes['number_format']
+
+            formats[name] = wb.add_format(properties)
+
+        return formats
+
+    def _create_with_xlsxwriter(self, activity_data: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Create a new Excel file with xlsxwriter.
+
+        Produces the same layout as _add_session_rows; formats are built once
+        from NAMED_STYLES and the XML is generated directly.
+
+        Args:
+            activity_data: Dictionary mapping dates to session data
+        """
+        wb = xlsxwriter.Workbook(str(self.excel_file))
+        ws = wb.add_worksheet("Activity Log")
+        formats = self._add_xlsxwriter_formats(wb)
+
+        # Same sheet layout as _set_column_widths and _apply_final_formatting
+        for column, width in enumerate(self.COLUMN_WIDTHS.values()):
+            ws.set_column(column, column, width)
+        ws.freeze_panes(1, 0)
+        ws.set_row(0, 25)
+        ws.set_default_row(18)
+
+        headers = ["Date", "Session", "Start Time", "End Time", "Duration"]
+        ws.write_row(0, 0, headers, formats['header'])
+
+        # Rows are zero-based here; formulas use one-based Excel row numbers
+        row = 1
+        for date_str, data in sorted(activity_data.items()):
+            sessions = data['sessions']
+            start_row = row
+
+            for i, session in enumerate(sessions):
+                session_style, start_style, end_style, duration_style = self.SESSION_ROW_STYLES[i % 2]
+                ws.write_string(row, 1, f"Session {i+1}", formats[session_style])
+                ws.write_number(row, 2, session['start_serial'], formats[start_style])
+                ws.write_number(row, 3, session['end_serial'], formats[end_style])
+                ws.write_formula(row, 4, f'=D{row + 1}-C{row + 1}', formats[duration_style])
+                row += 1
+
+            # Merge date cells if multiple sessions
+            if len(sessions) > 1:
+                ws.merge_range(start_row, 0, row - 1, 0, date_str, formats['date_merged'])
+            else:
+                ws.write_string(start_row, 0, date_str, formats['date_merged'])
+
+            label_style, blank_style, _, total_style = self.TOTAL_ROW_STYLES
+            ws.write_string(row, 1, "Daily Total", formats[label_style])
+            ws.write_blank(row, 2, None, formats[blank_style])
+            ws.write_blank(row, 3, None, formats[blank_style])
+            ws.write_formula(row, 4, f'=SUM(E{start_row + 1}:E{row})', formats[total_style])
+            row += 1
+
+        wb.close()
+
+    def _can_rebuild(self, date_index: Dict[str, List[tuple]]) -> bool:
+        """
+        Check that the Excel file's data can be rebuilt from the date index.
+
+        The workbook must have a single "Activity Log" sheet, every session row
+        must hold clean start and end times, every date label must be a
+        'YYYY-MM-DD' string, and every row must be a session, daily total or
+        blank row with the formulas this tool writes. Anything else, such as a
+        cleared time cell, a note, a date typed in by hand or an edited formula,
+        keeps the file on the in-place update path. Formatting and column
+        widths are not checked; a rebuild rewrites them with this tool's layout.
+
+        Args:
+            date_index: Existing session rows by date, from _build_date_index
+        """
+        if not all(isinstance(start, float) and isinstance(end, float)
+                   for session_rows in date_index.values() for _, start, end in session_rows):
+            return False
+
+        wb = openpyxl.load_workbook(self.excel_file, read_only=True)
+        try:
+            if wb.sheetnames != ["Activity Log"]:
+                return False
+
+            for row_idx, row in enumerate(wb.active.iter_rows(min_row=2, values_only=True), start=2):
+                # Blank cells may read back as None or as empty strings
+                values = [None if value == "" else value for value in row]
+                values += [None] * (5 - len(values))
+                date_value, label, start, end, duration = values[:5]
+
+                if any(value is not None for value in values[5:]):
+                    return False
+                if isinstance(label, str) and label.startswith("Session"):
+                    if duration != f'=D{row_idx}-C{row_idx}':
+                        return False
+                    if date_value is not None and self._parse_date_label(date_value) is None:
+                        return False
+                elif label == "Daily Total":
+                    if (date_value is not None or start is not None or end is not None
+                            or not isinstance(duration, str) or not duration.startswith('=SUM(E')):
+                        return False
+                elif any(value is not None for value in values):
+                    return False
+        finally:
+            wb.close()
+
+        return True
+
+    def _rebuild_excel(self, updates: Dict[str, List[Dict]],
+                       date_index: Dict[str, List[tuple]]) -> None:
+        """
+        Rewrite the Excel file with xlsxwriter from existing and new sessions.
+
+        Existing rows are kept as they are and the planned sessions are added,
+        as in the incremental update.
+
+        Args:
+            updates: Sessions to add by date, from _plan_excel_updates
+            date_index: Existing session rows by date, from _build_date_index
+        """
+        all_data = {
+            date_str: [{'start_serial': start, 'end_serial': end} for _, start, end in session_rows]
+            for date_str, session_rows in date_index.items()
+        }
+
+        for date_str, new_sessions in updates.items():
+            all_data.setdefault(date_str, []).extend(new_sessions)
+
+        self._create_with_xlsxwriter({
+            date_str: {'sessions': sessions, 'total_sessions': len(sessions)}
+            for date_str, sessions in all_data.items()
+        })
+
+    def _add_new_session_rows(self, ws, session_rows: List[int], new_sessions: List[Dict], start_row: int) -> None:
+        """Add only new session rows for an existing date, recording them in session_rows."""
+        existing_count = len(session_rows)
         current_row = start_row
 
         for i, session in enumerate(new_sessions):
             session_number = existing_count + i + 1  # Continue numbering from existing sessions
 
-            # Convert to time values for Excel
-            start_time = session['start'].time()
-            end_time = session['end'].time()
-
-            # Determine row color (alternating pattern based on total session count)
-            row_color = self.ALTERNATE_COLOR if (session_number - 1) % 2 == 1 else "FFFFFF"
-
-            # Session number column
-            session_cell = ws.cell(row=current_row, column=2, value=f"Session {session_number}")
-            session_cell.font = Font(size=9)
-            session_cell.fill = PatternFill(start_color=row_color, end_color=row_color, fill_type="solid")
-            session_cell.alignment = Alignment(horizontal='center', vertical='center')
-            session_cell.border = self.THIN_BORDER
-
-            # Start time column
-            start_cell = ws.cell(row=current_row, column=3, value=start_time)
-            start_cell.number_format = 'HH:MM'
-            start_cell.alignment = Alignment(horizontal='center', vertical='center')
-            start_cell.fill = PatternFill(start_color=row_color, end_color=row_color, fill_type="solid")
-            start_cell.border = self.THIN_BORDER
-
-            # End time column
-            end_cell = ws.cell(row=current_row, column=4, value=end_time)
-            end_cell.number_format = 'HH:MM'
-            end_cell.alignment = Alignment(horizontal='center', vertical='center')
-            end_cell.fill = PatternFill(start_color=row_color, end_color=row_color, fill_type="solid")
-            end_cell.border = self.THIN_BORDER
-
-            # Duration formula (End - Start)
-            duration_formula = f'=D{current_row}-C{current_row}'
-            duration_cell = ws.cell(row=current_row, column=5, value=duration_formula)
-            duration_cell.number_format = '[H]:MM'
-            duration_cell.alignment = Alignment(horizontal='center', vertical='center')
-            duration_cell.fill = PatternFill(start_color=row_color, end_color=row_color, fill_type="solid")
-            duration_cell.border = self.THIN_BORDER
+            # Session number, start/end Excel time serials and duration formula (End - Start);
+            # styles alternate based on total session count
+            values = (f"Session {session_number}", session['start_serial'], session['end_serial'],
+                      f'=D{current_row}-C{current_row}')
+            self._write_styled_row(ws, current_row, values, self.SESSION_ROW_STYLES[(session_number - 1) % 2])
 
+            session_rows.append(current_row)
             current_row += 1
 
         # Update daily total formula to include new sessions
-        self._update_daily_total(ws, date_str)
-
-    def _update_daily_total(self, ws, date_str: str) -> None:
-        """Update the daily total formula for a specific date."""
-        # Find all session rows for this date
-        session_rows = []
-        for row in range(2, ws.max_row + 1):
-            if ws.cell(row=row, column=1).value == date_str:
-                session_value = ws.cell(row=row, column=2).value
-                if session_value and isinstance(session_value, str) and session_value.startswith("Session"):
-                    session_rows.append(row)
+        self._update_daily_total(ws, session_rows)
 
+    def _update_daily_total(self, ws, session_rows: List[int]) -> None:
+        """Write the daily total row directly below the given session rows."""
         if not session_rows:
             return
 
-        # Find or create the total row
-        total_row = None
-        for row in range(min(session_rows), ws.max_row + 1):
-            if ws.cell(row=row, column=2).value == "Daily Total":
-                total_row = row
-                break
-
-        if not total_row:
-            # Create new total row after last session
-            total_row = max(session_rows) + 1
-
-            # Add daily total row
-            total_cell = ws.cell(row=total_row, column=2, value="Daily Total")
-            total_cell.font = Font(bold=True, size=10)
-            total_cell.fill = PatternFill(start_color=self.TOTAL_COLOR, end_color=self.TOTAL_COLOR, fill_type="solid")
-            total_cell.alignment = Alignment(horizontal='center', vertical='center')
-            total_cell.border = self.THIN_BORDER
-
-            # Empty cells for start/end columns in total row
-            for col in [3, 4]:
-                empty_cell = ws.cell(row=total_row, column=col, value="")
-                empty_cell.fill = PatternFill(start_color=self.TOTAL_COLOR, end_color=self.TOTAL_COLOR, fill_type="solid")
-                empty_cell.border = self.THIN_BORDER
-
-        # Update total duration formula
-        if session_rows:
-            start_formula_row = min(session_rows)
-            end_formula_row = max(session_rows)
-            total_formula = f'=SUM(E{start_formula_row}:E{end_formula_row})'
-
-            total_duration_cell = ws.cell(row=total_row, column=5, value=total_formula)
-            total_duration_cell.number_format = '[H]:MM'
-            total_duration_cell.font = Font(bold=True)
-            total_duration_cell.fill = PatternFill(start_color=self.TOTAL_COLOR, end_color=self.TOTAL_COLOR, fill_type="solid")
-            total_duration_cell.alignment = Alignment(horizontal='center', vertical='center')
-            total_duration_cell.border = self.THIN_BORDER
+        total_row = session_rows[-1] + 1
+
+        # Add daily total row with the total duration formula
+        total_formula = f'=SUM(E{session_rows[0]}:E{session_rows[-1]})'
+        self._write_styled_row(ws, total_row, ("Daily Total", "", "", total_formula), self.TOTAL_ROW_STYLES)
 
     def _apply_final_formatting(self, ws) -> None:
         """Apply final formatting touches to the worksheet."""
@@ -566,16 +990,15 @@ class ActivityTracker:
         # Set row heights for better appearance
         ws.row_dimensions[1].height = 25  # Header row
 
-        # Set default row height for data rows
-        for row_num in range(2, ws.max_row + 1):
-            ws.row_dimensions[row_num].height = 18
+        # Default height for data rows, without per-row metadata
+        ws.sheet_format.defaultRowHeight = 18
+        ws.sheet_format.customHeight = True
 
-    def _print_event_distribution(self, user_events: List[Dict[str, Any]]) -> None:
+    def _print_event_distribution(self, user_events: List[UserEvent]) -> None:
         """Print distribution of events by type for debugging."""
-        event_counts = {}
+        event_counts = defaultdict(int)
         for event in user_events:
-            event_id = event['EventID']
-            event_counts[event_id] = event_counts.get(event_id, 0) + 1
+            event_counts[event.event_id] += 1
 
         if event_counts:
             print("Event distribution:")
@@ -589,12 +1012,24 @@ class ActivityTracker:
         print(f"Tracking user: {self.username}")
         print("Reading Windows Security Event Log...")
 
-        # Get events
-        events = self.get_security_events()
-        print(f"Found {len(events)} relevant events")
-
-        # Filter for user
-        user_events = self.filter_user_events(events)
+        # Dates before the last one in Excel are complete; only read from its start.
+        # An unreadable file is reported again when it is updated below
+        date_index = None
+        since = None
+        if self.excel_file.exists():
+            try:
+                date_index = self._read_date_index()
+                since = self._get_resume_time(date_index)
+            except Exception as e:
+                print(f"Could not read existing Excel file, reading all events: {e}")
+                date_index = None
+                since = None
+
+        if since is not None:
+            print(f"Reading events since {since:%Y-%m-%d}")
+
+        # Stream events through the user filter; only matching events are kept
+        user_events = list(self._iter_user_events(since))
         print(f"Found {len(user_events)} events for user {self.username}")
 
         # Debug: Show event distribution by type
@@ -632,7 +1067,7 @@ class ActivityTracker:
 
         # Update Excel
         try:
-            self.create_or_update_excel(activity_data)
+            self.create_or_update_excel(activity_data, date_index)
             print(f"\nExcel file location: {self.excel_file}")
         except Exception as e:
             print(f"\nError updating Excel file: {e}")